@@ -2,50 +2,275 @@
 Challenge 1
 '''
 
-def cards_game(m, n, k, counts):
-    from collections import deque
+from array import array
 
-    cards = []
-    for person, card_list in counts.items():
-        for value, color in card_list:
-            cards.append((person, value, color))
+def cards_game(m, n, k, counts, stats=None, workers=None, mode='pairwise'):
+    from concurrent.futures import ProcessPoolExecutor
+    from time import perf_counter
 
-    num_cards = len(cards)
-    if num_cards == 0:
-        return 0
+    # Pass a dict as `stats` to collect phase timings and flow counters.
+    # With `workers` > 1 the independent components are solved in a
+    # process pool; otherwise they are solved one after another.
+    # mode='layered' merges identical cards, links them through per-layer
+    # lookups and solves with blocking flows; 'pairwise' keeps one node
+    # per card and compares every pair of cards.
+    if mode not in ('pairwise', 'layered'):
+        raise ValueError(f"unknown cards_game mode: {mode!r}")
 
-    source = 0
-    sink = num_cards + 1
+    if stats is not None:
+        phase_start = perf_counter()
 
-    capacity = {}
+    persons, values, colors = load_cards(counts)
 
-    def add_edge(u, v, cap):
-        capacity[(u, v)] = capacity.get((u, v), 0) + cap
+    num_cards = len(persons)
+
+    if stats is not None:
+        stats['num_cards'] = num_cards
+
+    if mode == 'layered':
+        node_values, multiplicity, adjacency = build_layered_graph(persons, values, colors, n)
+        solver = component_blocking_flow
+    else:
+        node_values = values
+        multiplicity = array('q', [1]) * num_cards
+        adjacency = [[] for _ in range(num_cards)]
+        solver = component_max_flow
+
+        for i in range(num_cards):
+            p1, v1, c1 = persons[i], values[i], colors[i]
+            for j in range(num_cards):
+                if i == j:
+                    continue
+
+                p2, v2, c2 = persons[j], values[j], colors[j]
+
+                next_person = (p1 % n) + 1
+                if p2 != p1 and p2 != next_person:
+                    continue
+
+                if (c2 == c1 and v2 == v1 + 1) or (c2 != c1 and v2 == v1):
+                    adjacency[i].append(j)
+
+    useful = prune_cards(node_values, adjacency, m)
+    components = split_components(adjacency, useful)
+
+    jobs = []
+    for component in components:
+        local = {card: idx + 1 for idx, card in enumerate(component)}
+        edges = []
+        for card in component:
+            node = local[card]
+            value = node_values[card]
+            if value == 1:
+                edges.append((0, node, multiplicity[card]))
+            if value == m:
+                edges.append((node, len(component) + 1, multiplicity[card]))
+            for neighbor in adjacency[card]:
+                if neighbor in local:
+                    edges.append((node, local[neighbor], multiplicity[card] * multiplicity[neighbor]))
+        jobs.append((len(component), edges, stats is not None))
+
+    if stats is not None:
+        stats['build_time'] = perf_counter() - phase_start
+        stats['pruned_cards'] = num_cards - sum(
+            multiplicity[card] for card in range(len(node_values)) if useful[card])
+        stats['num_components'] = len(components)
+        stats['augmenting_paths'] = 0
+        stats['path_lengths'] = []
+        stats['nodes_expanded'] = 0
+        stats['edges_scanned'] = 0
+        stats['peak_residual_edges'] = 0
+        phase_start = perf_counter()
+
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(solver, *zip(*jobs)))
+    else:
+        results = [solver(*job) for job in jobs]
+
+    max_flow = 0
+    for flow, component_stats in results:
+        max_flow += flow
+
+        if stats is not None:
+            stats['augmenting_paths'] += component_stats['augmenting_paths']
+            stats['path_lengths'].extend(component_stats['path_lengths'])
+            stats['nodes_expanded'] += component_stats['nodes_expanded']
+            stats['edges_scanned'] += component_stats['edges_scanned']
+            stats['peak_residual_edges'] = max(stats['peak_residual_edges'],
+                                               component_stats['peak_residual_edges'])
+
+    if stats is not None:
+        stats['solve_time'] = perf_counter() - phase_start
+
+    return max_flow
+
+
+def load_cards(counts):
+    # Cards are kept as three packed columns. `counts` may be the
+    # {person: [(value, color), ...]} mapping, three parallel int sequences
+    # (persons, values, colors), or a NumPy structured array with
+    # 'person', 'value' and 'color' fields.
+    if hasattr(counts, 'items'):
+        persons, values, colors = array('q'), array('q'), array('q')
+        for person, card_list in counts.items():
+            for value, color in card_list:
+                persons.append(person)
+                values.append(value)
+                colors.append(color)
+        return persons, values, colors
+
+    names = getattr(getattr(counts, 'dtype', None), 'names', None)
+    if names is not None:
+        counts = (counts['person'], counts['value'], counts['color'])
+
+    persons, values, colors = (as_column(column) for column in counts)
+    if not len(persons) == len(values) == len(colors):
+        raise ValueError("persons, values and colors must have the same length")
+
+    return persons, values, colors
+
+
+def as_column(column):
+    if isinstance(column, array) and column.typecode == 'q':
+        return column
+    if hasattr(column, 'astype'):
+        return array('q', column.astype('int64', copy=False).tobytes())
+    return array('q', column)
+
+
+def build_layered_graph(persons, values, colors, n):
+    # Identical cards are interchangeable and carry no capacity of their
+    # own, so each distinct (person, value, color) becomes one node and its
+    # edges carry the product of the multiplicities at both ends.
+    index = {}
+    node_persons, node_values, node_colors = array('q'), array('q'), array('q')
+    multiplicity = array('q')
+    for card in zip(persons, values, colors):
+        node = index.get(card)
+        if node is None:
+            node = index[card] = len(multiplicity)
+            node_persons.append(card[0])
+            node_values.append(card[1])
+            node_colors.append(card[2])
+            multiplicity.append(0)
+        multiplicity[node] += 1
+
+    # Nodes held by each person within one value layer.
+    layers = {}
+    for node in range(len(multiplicity)):
+        layers.setdefault((node_persons[node], node_values[node]), []).append(node)
+
+    adjacency = [[] for _ in range(len(multiplicity))]
+    for node in range(len(multiplicity)):
+        person, value, color = node_persons[node], node_values[node], node_colors[node]
+        next_person = (person % n) + 1
+        targets = (person,) if next_person == person else (person, next_person)
+
+        for target in targets:
+            for other in layers.get((target, value), ()):
+                if node_colors[other] != color:
+                    adjacency[node].append(other)
+
+            following = index.get((target, value + 1, color))
+            if following is not None:
+                adjacency[node].append(following)
+
+    return node_values, multiplicity, adjacency
+
+
+def prune_cards(values, adjacency, m):
+    # A card carries flow only if it is reachable from a value-1 card and
+    # can itself reach a value-m card.
+    num_cards = len(values)
+
+    reverse = [[] for _ in range(num_cards)]
+    for card, neighbors in enumerate(adjacency):
+        for neighbor in neighbors:
+            reverse[neighbor].append(card)
+
+    forward = reachable(adjacency, [c for c in range(num_cards) if values[c] == 1])
+    backward = reachable(reverse, [c for c in range(num_cards) if values[c] == m])
+
+    return [forward[c] and backward[c] for c in range(num_cards)]
+
+
+def reachable(adjacency, starts):
+    seen = [False] * len(adjacency)
+    stack = []
+    for card in starts:
+        if not seen[card]:
+            seen[card] = True
+            stack.append(card)
 
-    for idx, (person, value, color) in enumerate(cards):
-        node = idx + 1
-        if value == 1:
-            add_edge(source, node, 1)
+    while stack:
+        card = stack.pop()
+        for neighbor in adjacency[card]:
+            if not seen[neighbor]:
+                seen[neighbor] = True
+                stack.append(neighbor)
 
-    for idx, (person, value, color) in enumerate(cards):
-        node = idx + 1
-        if value == m:
-            add_edge(node, sink, 1)
+    return seen
 
-    for i, (p1, v1, c1) in enumerate(cards):
-        node1 = i + 1
-        for j, (p2, v2, c2) in enumerate(cards):
-            if i == j:
-                continue
 
-            node2 = j + 1
+def split_components(adjacency, useful):
+    # Weakly connected components of the useful cards, in card order.
+    undirected = [[] for _ in range(len(adjacency))]
+    for card, neighbors in enumerate(adjacency):
+        if not useful[card]:
+            continue
+        for neighbor in neighbors:
+            if useful[neighbor]:
+                undirected[card].append(neighbor)
+                undirected[neighbor].append(card)
 
-            next_person = (p1 % n) + 1
-            if p2 != p1 and p2 != next_person:
-                continue
+    seen = [False] * len(adjacency)
+    components = []
+    for start in range(len(adjacency)):
+        if not useful[start] or seen[start]:
+            continue
 
-            if (c2 == c1 and v2 == v1 + 1) or (c2 != c1 and v2 == v1):
-                add_edge(node1, node2, 1)
+        seen[start] = True
+        stack = [start]
+        component = []
+        while stack:
+            card = stack.pop()
+            component.append(card)
+            for neighbor in undirected[card]:
+                if not seen[neighbor]:
+                    seen[neighbor] = True
+                    stack.append(neighbor)
+
+        components.append(sorted(component))
+
+    return components
+
+
+def component_max_flow(num_nodes, edges, collect_stats=False):
+    from collections import deque
+
+    source = 0
+    sink = num_nodes + 1
+
+    capacity = {}
+    neighbors = [[] for _ in range(num_nodes + 2)]
+
+    for u, v, cap in edges:
+        if (u, v) not in capacity and (v, u) not in capacity:
+            neighbors[u].append(v)
+            neighbors[v].append(u)
+        capacity[(u, v)] = capacity.get((u, v), 0) + cap
+        capacity.setdefault((v, u), 0)
+
+    stats = None
+    if collect_stats:
+        stats = {
+            'augmenting_paths': 0,
+            'path_lengths': [],
+            'nodes_expanded': 0,
+            'edges_scanned': 0,
+            'peak_residual_edges': len(capacity),
+        }
 
     def bfs():
         parent = {}
@@ -57,9 +282,13 @@ def cards_game(m, n, k, counts):
 
             if u == sink:
                 return parent
-            
-            for (a, b) in capacity:
-                if a == u and b not in visited and capacity[(a, b)] > 0:
+
+            if stats is not None:
+                stats['nodes_expanded'] += 1
+                stats['edges_scanned'] += len(neighbors[u])
+
+            for b in neighbors[u]:
+                if b not in visited and capacity[(u, b)] > 0:
                     visited.add(b)
                     parent[b] = u
                     queue.append(b)
@@ -80,13 +309,112 @@ def cards_game(m, n, k, counts):
             path_flow = min(path_flow, capacity[(u, v)])
             v = u
 
+        path_length = 0
         v = sink
         while v != source:
             u = parent[v]
             capacity[(u, v)] -= path_flow
-            capacity[(v, u)] = capacity.get((v, u), 0) + path_flow
+            capacity[(v, u)] += path_flow
             v = u
+            path_length += 1
 
         max_flow += path_flow
 
-    return max_flow
+        if stats is not None:
+            stats['augmenting_paths'] += 1
+            stats['path_lengths'].append(path_length)
+
+    return max_flow, stats
+
+
+def component_blocking_flow(num_nodes, edges, collect_stats=False):
+    from collections import deque
+
+    source = 0
+    sink = num_nodes + 1
+    size = num_nodes + 2
+
+    # Edge arrays: edge e and its residual twin e ^ 1 are stored side by side.
+    head = [[] for _ in range(size)]
+    edge_to = []
+    edge_cap = []
+    for u, v, cap in edges:
+        head[u].append(len(edge_to))
+        edge_to.append(v)
+        edge_cap.append(cap)
+        head[v].append(len(edge_to))
+        edge_to.append(u)
+        edge_cap.append(0)
+
+    stats = None
+    if collect_stats:
+        stats = {
+            'augmenting_paths': 0,
+            'path_lengths': [],
+            'nodes_expanded': 0,
+            'edges_scanned': 0,
+            'peak_residual_edges': len(edge_to),
+        }
+
+    max_flow = 0
+
+    while True:
+        level = [-1] * size
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+
+            if stats is not None:
+                stats['nodes_expanded'] += 1
+                stats['edges_scanned'] += len(head[u])
+
+            for e in head[u]:
+                v = edge_to[e]
+                if edge_cap[e] > 0 and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+
+        if level[sink] < 0:
+            break
+
+        # Blocking flow on the level graph, one augmenting path at a time;
+        # pointer[u] skips edges already found saturated or dead.
+        pointer = [0] * size
+        while True:
+            path = []
+            u = source
+            while u != sink:
+                out = head[u]
+                while pointer[u] < len(out):
+                    e = out[pointer[u]]
+                    if edge_cap[e] > 0 and level[edge_to[e]] == level[u] + 1:
+                        break
+                    pointer[u] += 1
+                else:
+                    if u == source:
+                        path = None
+                        break
+                    e = path.pop()
+                    u = edge_to[e ^ 1]
+                    pointer[u] += 1
+                    continue
+
+                path.append(e)
+                u = edge_to[e]
+
+            if path is None:
+                break
+
+            path_flow = min(edge_cap[e] for e in path)
+            for e in path:
+                edge_cap[e] -= path_flow
+                edge_cap[e ^ 1] += path_flow
+
+            max_flow += path_flow
+
+            if stats is not None:
+                stats['augmenting_paths'] += 1
+                stats['path_lengths'].append(len(path))
+
+    return max_flow, stats
@@ -0,0 +1,128 @@
+# Result cache for repeated plan_city / cards_game instances
+
+import copy
+import hashlib
+import shelve
+from collections import OrderedDict
+
+
+class ResultCache:
+    # In-memory LRU bounded by `max_entries`. With `path`, results are also
+    # written through to a shelve file there, which survives restarts and
+    # refills the LRU on a memory miss.
+    def __init__(self, max_entries=1024, path=None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.store = shelve.open(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key])
+
+        if self.store is not None and key in self.store:
+            value = self.store[key]
+            self.remember(key, value)
+            self.hits += 1
+            return copy.deepcopy(value)
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        value = copy.deepcopy(value)
+        self.remember(key, value)
+        if self.store is not None:
+            self.store[key] = value
+
+    def remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def fingerprint(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def city_fingerprint(num_data_hubs, num_service_providers, connections, provider_capacities, preliminary_assignment):
+    # Dict and provider-list order do not change the instance, and every
+    # number is hashed as a plain int so NumPy scalars match Python ints.
+    return fingerprint(
+        'city',
+        int(num_data_hubs),
+        int(num_service_providers),
+        sorted((int(hub), sorted(map(int, providers))) for hub, providers in connections.items()),
+        tuple(map(int, provider_capacities)),
+        sorted((int(hub), int(provider)) for hub, provider in preliminary_assignment.items()),
+    )
+
+
+def cards_fingerprint(m, n, k, counts):
+    # Cards are compared as a multiset of plain-int triples, whichever input
+    # form and integer type they came in.
+    if hasattr(counts, 'items'):
+        cards = [(int(person), int(value), int(color))
+                 for person, card_list in counts.items()
+                 for value, color in card_list]
+    else:
+        names = getattr(getattr(counts, 'dtype', None), 'names', None)
+        if names is not None:
+            counts = (counts['person'], counts['value'], counts['color'])
+        cards = list(zip(*(map(int, column) for column in counts)))
+
+    return fingerprint('cards', int(m), int(n), int(k), sorted(cards))
+
+
+def cached_plan_city(cache, plan_city, num_data_hubs, num_service_providers, connections, provider_capacities, preliminary_assignment):
+    # An equivalent but reordered instance returns the result computed for
+    # the first one; for plan_city_e that is a valid, not necessarily
+    # identical, assignment.
+    key = plan_city.__name__ + ':' + city_fingerprint(
+        num_data_hubs, num_service_providers, connections, provider_capacities, preliminary_assignment)
+
+    result = cache.get(key)
+    if result is None:
+        result = plan_city(num_data_hubs, num_service_providers, connections,
+                           provider_capacities, preliminary_assignment)
+        cache.put(key, result)
+
+    return result
+
+
+def cached_cards_game(cache, cards_game, m, n, k, counts, **options):
+    # Solver options such as mode or workers do not change the answer, so
+    # they are left out of the key. Options only reach the solver on a
+    # miss; a `stats` dict gets stats['cache_hit'] either way and the solver
+    # counters only when the solver actually ran.
+    key = cards_game.__name__ + ':' + cards_fingerprint(m, n, k, counts)
+    stats = options.get('stats')
+
+    result = cache.get(key)
+    if result is None:
+        result = cards_game(m, n, k, counts, **options)
+        cache.put(key, result)
+        if stats is not None:
+            stats['cache_hit'] = False
+    elif stats is not None:
+        stats['cache_hit'] = True
+
+    return result
@@ -0,0 +1,155 @@
+# Batch runner for plan_city instance files
+#
+#   python -m problem_1.batch tests/test_files_p1 --solver e --workers 8 --output-dir out
+#
+# Each input is a directory (all *_in.txt inside) or a glob pattern. With
+# --output-dir every result is written to <name>_out.txt there as soon as
+# it is solved; otherwise results stream to stdout. Per-instance latency,
+# per-instance errors and overall throughput go to stderr; a bad instance
+# is reported and skipped, and the exit code is 1 if any instance failed.
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from problem_1.p1_d import plan_city_d
+from problem_1.p1_e import plan_city_e
+
+SOLVERS = {'d': plan_city_d, 'e': plan_city_e}
+
+
+def read_instance(path):
+    with open(path, 'r') as file:
+        n, k = map(int, file.readline().split())
+
+        connections = {i: [] for i in range(n)}
+        for i in range(n):
+            parts = list(map(int, file.readline().split()))
+            connections[i] = parts[1:parts[0] + 1]
+
+        provider_capacities = list(map(int, file.readline().split()))
+
+        parts = list(map(int, file.readline().split()))
+        preliminary_assignment = {i: parts[i] for i in range(n - 1)}
+
+    return dict(num_data_hubs=n, num_service_providers=k, connections=connections,
+                provider_capacities=[0] * n + provider_capacities,
+                preliminary_assignment=preliminary_assignment)
+
+
+def format_result(result, num_data_hubs, num_service_providers):
+    # plan_city_d answers yes/no. plan_city_e returns an assignment with one
+    # entry per hub on yes, and a certificate with one entry per hub and
+    # provider on no; the lengths only coincide without providers, where
+    # every hub is unassignable unless there are no hubs at all.
+    if isinstance(result, bool):
+        return ["Yes" if result else "No"]
+
+    if num_service_providers == 0:
+        feasible = num_data_hubs == 0
+    else:
+        feasible = len(result) == num_data_hubs
+    return ["Yes" if feasible else "No", " ".join(map(str, result))]
+
+
+def solve_instance(path, solver):
+    start = time.perf_counter()
+    instance = read_instance(path)
+    result = SOLVERS[solver](**instance)
+    lines = format_result(result, instance['num_data_hubs'], instance['num_service_providers'])
+    return path, lines, time.perf_counter() - start
+
+
+def find_instances(inputs):
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*_in.txt')
+        paths.extend(sorted(glob.glob(pattern)))
+    return paths
+
+
+def output_path(path, output_dir):
+    name = os.path.basename(path)
+    if name.endswith('_in.txt'):
+        name = name[:-len('_in.txt')] + '_out.txt'
+    else:
+        name += '.out'
+    return os.path.join(output_dir, name)
+
+
+def run_batch(paths, solver='e', workers=1, output_dir=None, stream=None, report=None):
+    stream = sys.stdout if stream is None else stream
+    report = sys.stderr if report is None else report
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def emit(path, lines, seconds):
+        if output_dir is not None:
+            with open(output_path(path, output_dir), 'w') as file:
+                file.write("\n".join(lines) + "\n")
+        else:
+            stream.write(f"# {path}\n" + "\n".join(lines) + "\n")
+            stream.flush()
+        print(f"{path}\t{seconds * 1000:.2f} ms", file=report)
+
+    failed = 0
+
+    def fail(path, exc):
+        nonlocal failed
+        failed += 1
+        print(f"{path}\terror: {type(exc).__name__}: {exc}", file=report)
+
+    start = time.perf_counter()
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(solve_instance, path, solver): path for path in paths}
+            for future in as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    fail(futures[future], exc)
+                else:
+                    emit(*outcome)
+    else:
+        for path in paths:
+            try:
+                outcome = solve_instance(path, solver)
+            except Exception as exc:
+                fail(path, exc)
+            else:
+                emit(*outcome)
+
+    elapsed = time.perf_counter() - start
+    solved = len(paths) - failed
+    throughput = solved / elapsed if elapsed > 0 else float('inf')
+    print(f"solved {solved} instances, {failed} failed, in {elapsed:.3f} s ({throughput:.1f} instances/s)",
+          file=report)
+
+    return solved, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve plan_city instance files in batch.")
+    parser.add_argument('inputs', nargs='+', help="directories of *_in.txt files or glob patterns")
+    parser.add_argument('--solver', choices=sorted(SOLVERS), default='e',
+                        help="d prints Yes/No only; e adds the assignment or certificate line")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--output-dir', help="write <name>_out.txt files here instead of stdout")
+    args = parser.parse_args(argv)
+
+    paths = find_instances(args.inputs)
+    if not paths:
+        parser.error("no instance files matched")
+
+    solved, failed = run_batch(paths, solver=args.solver, workers=args.workers, output_dir=args.output_dir)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,40 +1,30 @@
 # Problem 1d
 
-from collections import defaultdict, deque
+from collections import deque
+from time import perf_counter
 
-def plan_city_d(num_data_hubs, num_service_providers, connections, provider_capacities, preliminary_assignment):
-    SOURCE = 'source'
-    SINK = 'sink'
+def plan_city_d(num_data_hubs, num_service_providers, connections, provider_capacities, preliminary_assignment, stats=None):
+    # Pass a dict as `stats` to have it filled with phase timings and
+    # augmentation counters; with the default None nothing is recorded.
+    if stats is not None:
+        phase_start = perf_counter()
 
-    residual_graph = defaultdict(lambda: defaultdict(int))
+    network = FlowNetwork(num_data_hubs, num_service_providers, connections, provider_capacities)
 
-    for hub in range(num_data_hubs):
-        residual_graph[SOURCE][hub] = 1
+    if stats is not None:
+        stats['build_time'] = perf_counter() - phase_start
+        phase_start = perf_counter()
 
-    for hub, providers in connections.items():
-        for provider in providers:
-            residual_graph[hub][provider] = 1
+    network.warm_start(preliminary_assignment)
 
-    for provider in range(num_data_hubs, num_data_hubs + num_service_providers):
-        capacity = provider_capacities[provider]
-        if capacity > 0:
-            residual_graph[provider][SINK] = capacity
+    if stats is not None:
+        stats['warm_start_time'] = perf_counter() - phase_start
+        phase_start = perf_counter()
 
-    for hub, assigned_provider in preliminary_assignment.items():
+    max_flow = edmonds_karp(network, network.source, network.sink, stats)
 
-        if residual_graph[SOURCE][hub] > 0:
-            residual_graph[SOURCE][hub] -= 1
-            residual_graph[hub][SOURCE] += 1
-
-        if residual_graph[hub][assigned_provider] > 0:
-            residual_graph[hub][assigned_provider] -= 1
-            residual_graph[assigned_provider][hub] += 1
-
-        if residual_graph[assigned_provider][SINK] > 0:
-            residual_graph[assigned_provider][SINK] -= 1
-            residual_graph[SINK][assigned_provider] += 1
-
-    max_flow = edmonds_karp(residual_graph, SOURCE, SINK)
+    if stats is not None:
+        stats['solve_time'] = perf_counter() - phase_start
 
     required_flow = num_data_hubs
 
@@ -43,11 +33,81 @@ def plan_city_d(num_data_hubs, num_service_providers, connections, provider_capa
     return total_flow >= required_flow
 
 
-def edmonds_karp(residual_graph, source, sink):
+class FlowNetwork:
+    # Hubs are nodes 0..num_data_hubs-1, providers follow, then source and
+    # sink. Edge e and its reverse e ^ 1 sit side by side in the edge
+    # arrays; only `capacity` and `flow` are stored, and the residual
+    # capacity of an edge is derived from them.
+    __slots__ = ('num_data_hubs', 'source', 'sink', 'head', 'edge_to', 'capacity', 'flow',
+                 'source_edge', 'hub_edges', 'sink_edge')
+
+    def __init__(self, num_data_hubs, num_service_providers, connections, provider_capacities):
+        num_nodes = num_data_hubs + num_service_providers
+        self.num_data_hubs = num_data_hubs
+        self.source = num_nodes
+        self.sink = num_nodes + 1
+        self.head = [[] for _ in range(num_nodes + 2)]
+        self.edge_to = []
+        self.capacity = []
+        self.flow = []
+
+        self.source_edge = [self.add_edge(self.source, hub, 1) for hub in range(num_data_hubs)]
+
+        self.hub_edges = [{} for _ in range(num_data_hubs)]
+        for hub, providers in connections.items():
+            for provider in providers:
+                if provider not in self.hub_edges[hub]:
+                    self.hub_edges[hub][provider] = self.add_edge(hub, provider, 1)
+
+        self.sink_edge = {}
+        for provider in range(num_data_hubs, num_nodes):
+            capacity = provider_capacities[provider]
+            if capacity > 0:
+                self.sink_edge[provider] = self.add_edge(provider, self.sink, capacity)
+
+        # Scan a node's own edges before the reverse edges into it.
+        for node in range(num_nodes + 2):
+            self.head[node].sort(key=lambda e: e & 1)
+
+    def add_edge(self, u, v, capacity):
+        edge = len(self.edge_to)
+        self.head[u].append(edge)
+        self.edge_to.append(v)
+        self.capacity.append(capacity)
+        self.flow.append(0)
+        self.head[v].append(edge + 1)
+        self.edge_to.append(u)
+        self.capacity.append(0)
+        self.flow.append(0)
+        return edge
+
+    def residual(self, edge):
+        return self.capacity[edge] - self.flow[edge]
+
+    def push(self, edge, amount):
+        self.flow[edge] += amount
+        self.flow[edge ^ 1] -= amount
+
+    def warm_start(self, preliminary_assignment):
+        # One unit along source -> hub -> provider -> sink per assigned hub,
+        # skipping any edge that is missing or already full.
+        for hub, assigned_provider in preliminary_assignment.items():
+            path = (self.source_edge[hub],
+                    self.hub_edges[hub].get(assigned_provider),
+                    self.sink_edge.get(assigned_provider))
+            for edge in path:
+                if edge is not None and self.residual(edge) > 0:
+                    self.push(edge, 1)
+
+
+def edmonds_karp(network, source, sink, stats=None):
     max_flow = 0
 
+    if stats is not None:
+        init_flow_stats(stats)
+
     while True:
-        parent = bfs_find_path(residual_graph, source, sink)
+        parent = bfs_find_path(network, source, sink, stats)
 
         if parent is None:
             break
@@ -55,36 +115,74 @@ def edmonds_karp(residual_graph, source, sink):
         path_flow = float('inf')
         current = sink
         while current != source:
-            prev = parent[current]
-            path_flow = min(path_flow, residual_graph[prev][current])
-            current = prev
+            edge = parent[current]
+            path_flow = min(path_flow, network.residual(edge))
+            current = network.edge_to[edge ^ 1]
 
         current = sink
         while current != source:
-            prev = parent[current]
-            residual_graph[prev][current] -= path_flow
-            residual_graph[current][prev] += path_flow
-            current = prev
+            edge = parent[current]
+            network.push(edge, path_flow)
+            current = network.edge_to[edge ^ 1]
 
         max_flow += path_flow
 
+        if stats is not None:
+            record_augmentation(stats, network, parent, source, sink)
+
+    if stats is not None:
+        record_residual_size(stats, network)
+
     return max_flow
 
 
-def bfs_find_path(residual_graph, source, sink):
-    visited = set([source])
+def init_flow_stats(stats):
+    stats['augmenting_paths'] = 0
+    stats['path_lengths'] = []
+    stats['nodes_expanded'] = 0
+    stats['edges_scanned'] = 0
+    stats['peak_residual_edges'] = 0
+
+
+def record_augmentation(stats, network, parent, source, sink):
+    length = 0
+    current = sink
+    while current != source:
+        current = network.edge_to[parent[current] ^ 1]
+        length += 1
+
+    stats['augmenting_paths'] += 1
+    stats['path_lengths'].append(length)
+
+
+def record_residual_size(stats, network):
+    # The edge arrays are sized once up front, so this is also the peak.
+    stats['peak_residual_edges'] = max(stats['peak_residual_edges'], len(network.edge_to))
+
+
+def bfs_find_path(network, source, sink, stats=None):
+    # Returns, for every node reached, the edge it was reached through.
+    parent = [None] * len(network.head)
+    parent[source] = -1
     queue = deque([source])
-    parent = {}
+    edge_to = network.edge_to
+    capacity = network.capacity
+    flow = network.flow
 
     while queue:
         current = queue.popleft()
 
         if current == sink:
             return parent
-        for neighbor, capacity in residual_graph[current].items():
-            if neighbor not in visited and capacity > 0:
-                visited.add(neighbor)
-                parent[neighbor] = current
+
+        if stats is not None:
+            stats['nodes_expanded'] += 1
+            stats['edges_scanned'] += len(network.head[current])
+
+        for edge in network.head[current]:
+            neighbor = edge_to[edge]
+            if parent[neighbor] is None and capacity[edge] > flow[edge]:
+                parent[neighbor] = edge
                 queue.append(neighbor)
 
-    return None
\ No newline at end of file
+    return None
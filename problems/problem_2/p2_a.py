@@ -11,18 +11,20 @@ def linear_search(packages, boxes):
     total_waste = 0
     can_fit_all = True
 
+    # Both lists are sorted, so the smallest fitting box for each package
+    # only ever moves right: sweep them together instead of rescanning.
+    box_idx = 0
+    num_boxes = len(sorted_boxes)
+
     for package in sorted_packages:
-      best_box = None
-      for box in sorted_boxes:
-        if box >= package:
-          if best_box is None or box < best_box:
-            best_box = box
+      while box_idx < num_boxes and sorted_boxes[box_idx] < package:
+        box_idx += 1
 
-      if best_box is None:
+      if box_idx == num_boxes:
         can_fit_all = False
         break
 
-      total_waste += best_box - package
+      total_waste += sorted_boxes[box_idx] - package
 
     if can_fit_all:
       min_waste = min(min_waste, total_waste)
@@ -30,4 +32,4 @@ def linear_search(packages, boxes):
   if min_waste == float('inf'):
     return -1
 
-  return min_waste
\ No newline at end of file
+  return min_waste
@@ -0,0 +1,80 @@
+import unittest
+import io
+import os
+import shutil
+import sys
+import tempfile
+sys.path.append("..")
+
+from problem_1.batch import find_instances, format_result, main, run_batch
+from problem_1.p1_d import plan_city_d
+from problem_1.p1_e import plan_city_e
+from test_problem_1 import verify_result_c
+
+
+class TestBatch(unittest.TestCase):
+    def check_outputs(self, paths, output_dir):
+        for path in paths:
+            out_name = os.path.basename(path).replace("_in.txt", "_out.txt")
+            with open(os.path.join(output_dir, out_name), 'r') as file:
+                verdict = file.readline().strip()
+                result = list(map(int, file.readline().split()))
+            with open(path.replace("_in.txt", "_out.txt"), 'r') as file:
+                self.assertEqual(verdict, file.readline().strip())
+            self.assertTrue(verify_result_c(path, result))
+
+    def test_batch_matches_truth_files(self):
+        paths = find_instances(["./test_files_p1/test_[0-3]_in.txt"])
+        self.assertEqual(len(paths), 4)
+        for workers in (1, 2):
+            with tempfile.TemporaryDirectory() as output_dir:
+                report = io.StringIO()
+                self.assertEqual(run_batch(paths, workers=workers, output_dir=output_dir, report=report), (4, 0))
+                self.check_outputs(paths, output_dir)
+                self.assertIn("solved 4 instances, 0 failed", report.getvalue())
+
+    def test_batch_skips_malformed_instance(self):
+        with tempfile.TemporaryDirectory() as input_dir:
+            for name in ("test_0_in.txt", "test_1_in.txt"):
+                shutil.copy(os.path.join("./test_files_p1", name), input_dir)
+            with open(os.path.join(input_dir, "test_05_in.txt"), 'w') as file:
+                file.write("5 5\n2 5 6\n")
+
+            paths = find_instances([input_dir])
+            self.assertEqual(len(paths), 3)
+            for workers in (1, 2):
+                with tempfile.TemporaryDirectory() as output_dir:
+                    report = io.StringIO()
+                    self.assertEqual(run_batch(paths, workers=workers, output_dir=output_dir, report=report), (2, 1))
+                    self.assertEqual(sorted(os.listdir(output_dir)), ["test_0_out.txt", "test_1_out.txt"])
+                    self.assertIn(os.path.join(input_dir, "test_05_in.txt") + "\terror: ", report.getvalue())
+                    self.assertIn("solved 2 instances, 1 failed", report.getvalue())
+
+            with tempfile.TemporaryDirectory() as output_dir:
+                stderr = sys.stderr
+                sys.stderr = io.StringIO()
+                try:
+                    self.assertEqual(main([input_dir, "--workers", "1", "--output-dir", output_dir]), 1)
+                finally:
+                    sys.stderr = stderr
+
+    def test_verdict_follows_result_shape(self):
+        instance = dict(num_data_hubs=2, num_service_providers=1,
+                        connections={0: [], 1: [2]},
+                        provider_capacities=[0, 0, 2],
+                        preliminary_assignment={0: 2})
+        self.assertEqual(format_result(plan_city_d(**instance), 2, 1), ["Yes"])
+        self.assertEqual(format_result(plan_city_e(**instance), 2, 1), ["Yes", "0 2"])
+        self.assertEqual(format_result([0, 0, 1], 2, 1), ["No", "0 0 1"])
+        self.assertEqual(format_result([0, 0], 2, 0), ["No", "0 0"])
+        self.assertEqual(format_result([], 0, 0), ["Yes", ""])
+
+    def test_batch_streams_to_stdout(self):
+        paths = find_instances(["./test_files_p1/test_0_in.txt"])
+        stream = io.StringIO()
+        run_batch(paths, solver='d', stream=stream, report=io.StringIO())
+        self.assertEqual(stream.getvalue(), "# ./test_files_p1/test_0_in.txt\nNo\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
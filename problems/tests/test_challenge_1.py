@@ -1,5 +1,12 @@
 import unittest
+try:
+    import numpy
+except ImportError:
+    numpy = None
+import random
 import sys
+from array import array
+from types import MappingProxyType
 sys.path.append("..")
 
 from challenge_1.cards_a import cards_game
@@ -19,6 +26,83 @@ class TestChallenge1(unittest.TestCase):
                     2: [(1,1), (2,1)],
                     3: [(3,2)]}),
                     1)
+
+    def test_stats_report(self):
+        stats = {}
+        self.assertEqual(cards_game(m=3, k=2, n=3, counts = {
+                    1: [(1,2),(3,2)],
+                    2: [(1,1), (2,1), (2,2)],
+                    3: [(2,2), (3,2)]}, stats=stats),
+                    2)
+        self.assertEqual(stats['augmenting_paths'], 2)
+        self.assertEqual(stats['num_cards'], 7)
+        self.assertGreater(stats['edges_scanned'], 0)
+
+        stats = {}
+        self.assertEqual(cards_game(m=3, k=2, n=2, counts={}, stats=stats), 0)
+        for key in ('num_cards', 'pruned_cards', 'num_components', 'augmenting_paths',
+                    'nodes_expanded', 'edges_scanned', 'peak_residual_edges'):
+            self.assertEqual(stats[key], 0)
+        self.assertEqual(stats['path_lengths'], [])
+        for phase in ('build_time', 'solve_time'):
+            self.assertGreaterEqual(stats[phase], 0)
+
+    def test_independent_components(self):
+        counts = {
+            1: [(1,1), (2,1), (3,1)],
+            2: [(2,3)],
+            4: [(1,2), (2,2), (3,2)],
+            6: [(3,1)]}
+        stats = {}
+        self.assertEqual(cards_game(m=3, k=3, n=6, counts=counts, stats=stats), 2)
+        self.assertEqual(stats['num_components'], 2)
+        self.assertEqual(stats['pruned_cards'], 2)
+        self.assertEqual(cards_game(m=3, k=3, n=6, counts=counts, workers=2), 2)
+
+    def test_layered_matches_pairwise(self):
+        rng = random.Random(29)
+        for _ in range(300):
+            m, n, k = rng.randint(1, 6), rng.randint(1, 4), rng.randint(1, 3)
+            counts = {person: [(rng.randint(1, m), rng.randint(1, k))
+                               for _ in range(rng.randint(0, 10))]
+                      for person in range(1, n + 1)}
+            self.assertEqual(cards_game(m=m, k=k, n=n, counts=counts, mode='layered'),
+                             cards_game(m=m, k=k, n=n, counts=counts),
+                             (m, n, k, counts))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            cards_game(m=3, k=2, n=3, counts={1: [(1,2)]}, mode='bogus')
+        with self.assertRaises(ValueError):
+            cards_game(m=3, k=2, n=3, counts={}, mode='bogus')
+
+    def test_columnar_counts(self):
+        persons = array('q', [1, 1, 2, 2, 2, 3, 3])
+        values = array('q', [1, 3, 1, 2, 2, 2, 3])
+        colors = array('q', [2, 2, 1, 1, 2, 2, 2])
+        for mode in ('pairwise', 'layered'):
+            self.assertEqual(cards_game(m=3, k=2, n=3, counts=(persons, values, colors), mode=mode), 2)
+            self.assertEqual(cards_game(m=3, k=2, n=3, counts=(list(persons), list(values), list(colors)), mode=mode), 2)
+        with self.assertRaises(ValueError):
+            cards_game(m=3, k=2, n=3, counts=([1, 2], [1], [1, 1]))
+
+    def test_mapping_counts(self):
+        counts = MappingProxyType({
+                    1: [(1,2),(3,2)],
+                    2: [(1,1), (2,1), (2,2)],
+                    3: [(2,2), (3,2)]})
+        self.assertEqual(cards_game(m=3, k=2, n=3, counts=counts), 2)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_numpy_counts(self):
+        persons = numpy.array([1, 1, 2, 2, 2, 3, 3], dtype=numpy.int32)
+        values = numpy.array([1, 3, 1, 2, 2, 2, 3])
+        colors = numpy.array([2, 2, 1, 1, 2, 2, 2])
+        structured = numpy.zeros(7, dtype=[('person', 'i8'), ('value', 'i4'), ('color', 'i2')])
+        structured['person'], structured['value'], structured['color'] = persons, values, colors
+        for mode in ('pairwise', 'layered'):
+            self.assertEqual(cards_game(m=3, k=2, n=3, counts=(persons, values, colors), mode=mode), 2)
+            self.assertEqual(cards_game(m=3, k=2, n=3, counts=structured, mode=mode), 2)
         
     def test_correctness_challenge_a3(self):
         """Public Test """
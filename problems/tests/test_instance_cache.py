@@ -0,0 +1,116 @@
+import unittest
+import os
+import sys
+import tempfile
+try:
+    import numpy
+except ImportError:
+    numpy = None
+sys.path.append("..")
+
+from common.instance_cache import (ResultCache, cached_cards_game, cached_plan_city,
+                                   cards_fingerprint, city_fingerprint)
+from challenge_1.cards_a import cards_game
+from problem_1.p1_d import plan_city_d
+from problem_1.p1_e import plan_city_e
+
+
+class CountingSolver:
+    def __init__(self, solver):
+        self.solver = solver
+        self.__name__ = solver.__name__
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.solver(*args, **kwargs)
+
+
+CITY = dict(num_data_hubs=3, num_service_providers=2,
+            connections={0: [3], 1: [3, 4], 2: [4]},
+            provider_capacities=[0, 0, 0, 2, 1],
+            preliminary_assignment={0: 3})
+
+REORDERED_CITY = dict(num_data_hubs=3, num_service_providers=2,
+                      connections={2: [4], 1: [4, 3], 0: [3]},
+                      provider_capacities=[0, 0, 0, 2, 1],
+                      preliminary_assignment={0: 3})
+
+
+class TestInstanceCache(unittest.TestCase):
+    def test_fingerprints_ignore_order(self):
+        self.assertEqual(city_fingerprint(**CITY), city_fingerprint(**REORDERED_CITY))
+        self.assertNotEqual(city_fingerprint(**CITY),
+                            city_fingerprint(**dict(CITY, provider_capacities=[0, 0, 0, 1, 1])))
+
+        counts = {1: [(1, 2), (3, 2)], 2: [(1, 1), (2, 1), (2, 2)], 3: [(2, 2), (3, 2)]}
+        columns = ([3, 2, 1, 2, 2, 3, 1], [3, 2, 1, 2, 1, 2, 3], [2, 2, 2, 1, 1, 2, 2])
+        self.assertEqual(cards_fingerprint(3, 3, 2, counts), cards_fingerprint(3, 3, 2, columns))
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_fingerprints_ignore_numpy_int_types(self):
+        i = numpy.int64
+        numpy_city = dict(num_data_hubs=i(3), num_service_providers=i(2),
+                          connections={i(0): [i(3)], i(1): [i(3), i(4)], i(2): [i(4)]},
+                          provider_capacities=numpy.array([0, 0, 0, 2, 1]),
+                          preliminary_assignment={i(0): i(3)})
+        self.assertEqual(city_fingerprint(**numpy_city), city_fingerprint(**CITY))
+
+        counts = {1: [(1, 2), (3, 2)], 2: [(1, 1), (2, 1), (2, 2)], 3: [(2, 2), (3, 2)]}
+        numpy_counts = {i(person): [(i(value), numpy.int32(color)) for value, color in cards]
+                        for person, cards in counts.items()}
+        columns = (numpy.array([3, 2, 1, 2, 2, 3, 1]), numpy.array([3, 2, 1, 2, 1, 2, 3]),
+                   numpy.array([2, 2, 2, 1, 1, 2, 2]))
+        self.assertEqual(cards_fingerprint(3, 3, 2, numpy_counts), cards_fingerprint(3, 3, 2, counts))
+        self.assertEqual(cards_fingerprint(i(3), i(3), i(2), numpy_counts), cards_fingerprint(3, 3, 2, columns))
+
+    def test_cached_plan_city(self):
+        cache = ResultCache()
+        solver = CountingSolver(plan_city_e)
+        first = cached_plan_city(cache, solver, **CITY)
+        first.append(-1)
+        self.assertEqual(cached_plan_city(cache, solver, **REORDERED_CITY), plan_city_e(**CITY))
+        self.assertEqual(solver.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        self.assertEqual(cached_plan_city(cache, plan_city_d, **CITY), True)
+        self.assertEqual(len(cache), 2)
+
+    def test_cached_cards_game_marks_hits_in_stats(self):
+        cache = ResultCache()
+        counts = {1: [(1, 2), (3, 2)], 2: [(1, 1), (2, 1), (2, 2)], 3: [(2, 2), (3, 2)]}
+
+        stats = {}
+        self.assertEqual(cached_cards_game(cache, cards_game, 3, 3, 2, counts, stats=stats), 2)
+        self.assertEqual(stats['cache_hit'], False)
+        self.assertEqual(stats['augmenting_paths'], 2)
+
+        stats = {}
+        self.assertEqual(cached_cards_game(cache, cards_game, 3, 3, 2, counts, stats=stats), 2)
+        self.assertEqual(stats, {'cache_hit': True})
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_disk_store(self):
+        counts = {1: [(1, 2), (3, 2)], 2: [(1, 1), (2, 1), (2, 2)], 3: [(2, 2), (3, 2)]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results')
+            with ResultCache(path=path) as cache:
+                self.assertEqual(cached_cards_game(cache, cards_game, 3, 3, 2, counts), 2)
+
+            solver = CountingSolver(cards_game)
+            with ResultCache(path=path) as cache:
+                self.assertEqual(cached_cards_game(cache, solver, 3, 3, 2, counts, mode='layered'), 2)
+            self.assertEqual(solver.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,9 @@ import unittest
 import sys
 sys.path.append("..")
 
-from problem_1.p1_d import plan_city_d
+from problem_1.p1_d import FlowNetwork, plan_city_d
 from problem_1.p1_e import plan_city_e
+from problem_1.batch import read_instance
 
 
 def verify_result_b(input_name, result):
@@ -37,27 +38,7 @@ def verify_result_c(input_name, result):
 
 
 def read_input(input_name, test_func, type='b'):
-    with open(input_name, 'r') as file:
-        n, k = map(int, file.readline().split())
-
-        neighbours = {i: [] for i in range(n)}
-        recruiterCapacities = [0] * (n + k)
-        preliminary_assignment = {}
-
-        for i in range(n):
-            parts = list(map(int, file.readline().split()))
-            numRecruiters = parts[0]
-            for j in range(1, numRecruiters + 1):
-                recruiter = parts[j]
-                neighbours[i].append(recruiter)
-
-        recruiterCapacities = list(map(int, file.readline().split()))
-
-        parts = list(map(int, file.readline().split()))
-        for i in range(n - 1):
-            preliminary_assignment[i] = parts[i]
-
-    result = test_func(num_data_hubs=n, num_service_providers=k, connections=neighbours, provider_capacities=[0]*n + recruiterCapacities, preliminary_assignment=preliminary_assignment)
+    result = test_func(**read_instance(input_name))
     if type=='b':
         return verify_result_b(input_name, result)
     if type=='c':
@@ -87,6 +68,34 @@ class TestProblem1(unittest.TestCase):
         ]
         for input_file in input_files:
             self.assertEqual(read_input(input_file, plan_city_e, type='c'), True)
+
+    def test_stats_report(self):
+        for plan_city in (plan_city_d, plan_city_e):
+            stats = {}
+            plan_city(num_data_hubs=3, num_service_providers=2,
+                      connections={0: [3], 1: [3, 4], 2: [4]},
+                      provider_capacities=[0, 0, 0, 2, 1],
+                      preliminary_assignment={0: 3}, stats=stats)
+            self.assertEqual(stats['augmenting_paths'], 2)
+            self.assertEqual(len(stats['path_lengths']), 2)
+            self.assertGreater(stats['edges_scanned'], 0)
+            self.assertGreater(stats['peak_residual_edges'], 0)
+            for phase in ('build_time', 'warm_start_time', 'solve_time'):
+                self.assertGreaterEqual(stats[phase], 0)
+
+    def test_warm_start_writes_flow(self):
+        network = FlowNetwork(3, 2, {0: [3], 1: [3, 4], 2: [4]}, [0, 0, 0, 2, 1])
+        network.warm_start({0: 3, 1: 3})
+        self.assertEqual([network.flow[network.source_edge[hub]] for hub in range(3)], [1, 1, 0])
+        self.assertEqual(network.flow[network.hub_edges[0][3]], 1)
+        self.assertEqual(network.flow[network.hub_edges[1][3]], 1)
+        self.assertEqual(network.flow[network.hub_edges[1][4]], 0)
+        self.assertEqual(network.flow[network.sink_edge[3]], 2)
+        self.assertEqual(network.flow[network.sink_edge[4]], 0)
+        self.assertEqual([network.residual(network.source_edge[hub]) for hub in range(3)], [0, 0, 1])
+        self.assertEqual(network.residual(network.hub_edges[1][3]), 0)
+        self.assertEqual(network.residual(network.sink_edge[3]), 0)
+        self.assertEqual(network.residual(network.sink_edge[3] ^ 1), 2)
         
         
 
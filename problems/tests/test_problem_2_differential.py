@@ -0,0 +1,49 @@
+import unittest
+import random
+import sys
+sys.path.append("..")
+
+from problem_2.p2_a import linear_search
+from problem_2.p2_b import binary_search
+
+
+def brute_force(packages, boxes):
+    min_waste = -1
+    for supplier_boxes in boxes:
+        total_waste = 0
+        for package in packages:
+            fitting = [box for box in supplier_boxes if box >= package]
+            if not fitting:
+                break
+            total_waste += min(fitting) - package
+        else:
+            if min_waste == -1 or total_waste < min_waste:
+                min_waste = total_waste
+    return min_waste
+
+
+def random_instance(rng, max_packages, max_suppliers, max_boxes, max_size):
+    packages = [rng.randint(1, max_size) for _ in range(rng.randint(1, max_packages))]
+    boxes = [[rng.randint(1, max_size) for _ in range(rng.randint(1, max_boxes))]
+             for _ in range(rng.randint(1, max_suppliers))]
+    return packages, boxes
+
+
+class TestProblem2Differential(unittest.TestCase):
+    def test_small_against_brute_force(self):
+        rng = random.Random(5112)
+        for _ in range(2000):
+            packages, boxes = random_instance(rng, 8, 4, 6, 20)
+            expected = brute_force(packages, boxes)
+            self.assertEqual(linear_search(packages, boxes), expected, (packages, boxes))
+            self.assertEqual(binary_search(packages, boxes), expected, (packages, boxes))
+
+    def test_large_linear_against_binary(self):
+        rng = random.Random(4)
+        for _ in range(20):
+            packages, boxes = random_instance(rng, 2000, 20, 500, 10 ** 5)
+            self.assertEqual(linear_search(packages, boxes), binary_search(packages, boxes))
+
+
+if __name__ == '__main__':
+    unittest.main()